@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['vendor', 'is_active'], name='dsd_item_vendor__79f39b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pendingcostchange',
+            index=models.Index(fields=['item', 'status'], name='dsd_pending_item_id_c0f035_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pendingcostchange',
+            index=models.Index(fields=['status', 'effective_date'], name='dsd_pending_status_d9495a_idx'),
+        ),
+    ]
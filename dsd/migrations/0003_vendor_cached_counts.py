@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    Vendor = apps.get_model('dsd', 'Vendor')
+    Item = apps.get_model('dsd', 'Item')
+    active_items = (
+        Item.objects.filter(vendor=OuterRef('pk'), is_active=True)
+        .order_by().values('vendor')
+        .annotate(c=Count('pk')).values('c')
+    )
+    pending_items = (
+        Item.objects.filter(vendor=OuterRef('pk'),
+                            pending_cost_changes__status='PENDING')
+        .order_by().values('vendor')
+        .annotate(c=Count('pk', distinct=True)).values('c')
+    )
+    Vendor.objects.update(
+        active_item_count_cached=Coalesce(Subquery(active_items), 0),
+        pending_cost_change_count_cached=Coalesce(Subquery(pending_items), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0002_worklist_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='active_item_count_cached',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='pending_cost_change_count_cached',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
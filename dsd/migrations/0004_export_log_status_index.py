@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0003_vendor_cached_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='brdataexportlog',
+            index=models.Index(fields=['export_status', 'export_date'], name='dsd_brdata__export__5922b4_idx'),
+        ),
+    ]
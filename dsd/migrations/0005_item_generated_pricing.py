@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:03
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0004_export_log_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='margin',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(case_pack__gt=0, retail_price__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('retail_price'), '-', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('case_cost'), '-', models.F('allowance')), '/', models.F('case_pack'))), '/', models.F('retail_price'))), default=None), output_field=models.DecimalField(decimal_places=4, max_digits=10)),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='net_case_cost',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('case_cost'), '-', models.F('allowance')), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='unit_cost',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=models.Case(models.When(case_pack__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('case_cost'), '-', models.F('allowance')), '/', models.F('case_pack'))), default=None), output_field=models.DecimalField(decimal_places=4, max_digits=12)),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0005_item_generated_pricing'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['vendor', 'seq', 'description'], name='dsd_item_vendor__1441df_idx'),
+        ),
+    ]
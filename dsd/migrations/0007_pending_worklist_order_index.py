@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0006_item_ordering_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pendingcostchange',
+            index=models.Index(fields=['status', 'effective_date', 'vendor_code'], name='dsd_pending_status_b1c06e_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='pendingcostchange',
+            name='dsd_pending_status_d9495a_idx',
+        ),
+    ]
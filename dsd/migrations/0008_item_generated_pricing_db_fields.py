@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:35
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dsd', '0007_pending_worklist_order_index'),
+    ]
+
+    # The generated columns keep their names; only the model attributes
+    # change, so there is no DDL
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RenameField(
+                    model_name='item',
+                    old_name='net_case_cost',
+                    new_name='db_net_case_cost',
+                ),
+                migrations.RenameField(
+                    model_name='item',
+                    old_name='unit_cost',
+                    new_name='db_unit_cost',
+                ),
+                migrations.RenameField(
+                    model_name='item',
+                    old_name='margin',
+                    new_name='db_margin',
+                ),
+                migrations.AlterField(
+                    model_name='item',
+                    name='db_margin',
+                    field=models.GeneratedField(db_column='margin', db_persist=True, expression=models.Case(models.When(case_pack__gt=0, retail_price__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('retail_price'), '-', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('case_cost'), '-', models.F('allowance')), '/', models.F('case_pack'))), '/', models.F('retail_price'))), default=None), output_field=models.DecimalField(decimal_places=4, max_digits=10)),
+                ),
+                migrations.AlterField(
+                    model_name='item',
+                    name='db_net_case_cost',
+                    field=models.GeneratedField(db_column='net_case_cost', db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('case_cost'), '-', models.F('allowance')), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+                ),
+                migrations.AlterField(
+                    model_name='item',
+                    name='db_unit_cost',
+                    field=models.GeneratedField(db_column='unit_cost', db_index=True, db_persist=True, expression=models.Case(models.When(case_pack__gt=0, then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('case_cost'), '-', models.F('allowance')), '/', models.F('case_pack'))), default=None), output_field=models.DecimalField(decimal_places=4, max_digits=12)),
+                ),
+            ],
+        ),
+    ]
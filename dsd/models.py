@@ -8,15 +8,48 @@ Terminology:
     Price Change = buyer-initiated change to what the customer pays
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case, Count, F, OuterRef, Prefetch, Subquery, When,
+)
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.functional import cached_property
+from collections import defaultdict, namedtuple
 from decimal import Decimal
 
 
 # ============================================================
 # VENDOR
 # ============================================================
+class VendorQuerySet(models.QuerySet):
+
+    def refresh_counts(self):
+        """
+        Recompute the denormalized count columns for these vendors in a
+        single UPDATE. Signals keep them current for per-row saves; call
+        this after bulk writes (bulk_create, queryset.update, bulk_update)
+        which skip them. That includes any bulk write of Item.is_active or
+        Item.vendor, or the dashboard's active item total goes stale.
+        """
+        active_items = (
+            Item.objects.filter(vendor=OuterRef('pk'), is_active=True)
+            .order_by().values('vendor')
+            .annotate(c=Count('pk')).values('c')
+        )
+        pending_items = (
+            Item.objects.filter(vendor=OuterRef('pk'),
+                                pending_cost_changes__status='PENDING')
+            .order_by().values('vendor')
+            .annotate(c=Count('pk', distinct=True)).values('c')
+        )
+        return self.update(
+            active_item_count_cached=Coalesce(Subquery(active_items), 0),
+            pending_cost_change_count_cached=Coalesce(Subquery(pending_items), 0),
+        )
+
+
 class Vendor(models.Model):
 
     COMM_METHOD_CHOICES = [
@@ -44,6 +77,12 @@ class Vendor(models.Model):
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
 
+    # Denormalized counts — maintained by dsd.signals
+    active_item_count_cached            = models.PositiveIntegerField(default=0)
+    pending_cost_change_count_cached    = models.PositiveIntegerField(default=0)
+
+    objects = VendorQuerySet.as_manager()
+
     class Meta:
         db_table            = 'dsd_vendor'
         ordering            = ['vendor_code']
@@ -53,15 +92,15 @@ class Vendor(models.Model):
     def __str__(self):
         return f'{self.vendor_code} — {self.vendor_name}'
 
+    # ---- Counts (read from the denormalized columns) ----
+
     @property
     def active_item_count(self):
-        return self.items.filter(is_active=True).count()
+        return self.active_item_count_cached
 
     @property
     def pending_cost_change_count(self):
-        return self.items.filter(
-            pending_cost_changes__status='PENDING'
-        ).distinct().count()
+        return self.pending_cost_change_count_cached
 
 
 # ============================================================
@@ -95,8 +134,33 @@ class LinkGroup(models.Model):
 # Composite natural key: (vendor_code, upc)
 # UPC always stored normalized - no hyphens or spaces
 # ============================================================
+# Columns the price book reads off an item's pending cost change
+PENDING_PREVIEW_FIELDS = (
+    'id', 'item', 'status', 'new_case_cost', 'new_allowance',
+    'suggested_retail', 'effective_date',
+)
+
+
+class ItemQuerySet(models.QuerySet):
+
+    def with_pending(self):
+        """
+        Prefetch PENDING cost changes in one batched query so
+        has_pending_cost_change / pending_cost_change don't query per row.
+        """
+        return self.prefetch_related(Prefetch(
+            'pending_cost_changes',
+            queryset=PendingCostChange.objects.filter(status='PENDING')
+                     .only(*PENDING_PREVIEW_FIELDS),
+            to_attr='_pending_pcc_cache',
+        ))
+
+
 class Item(models.Model):
 
+    # vendor and is_active feed Vendor.active_item_count_cached, which the
+    # dashboard sums. Signals only see per-row saves — any bulk write of
+    # either field must call Vendor.objects.refresh_counts() afterwards.
     vendor          = models.ForeignKey(
                         Vendor, on_delete=models.RESTRICT,
                         related_name='items',
@@ -138,39 +202,94 @@ class Item(models.Model):
                         help_text='Units sold — sourced from BRData')
     movement_updated_at = models.DateTimeField(null=True, blank=True)
 
+    # Stored generated columns, computed by the database — for filtering,
+    # ordering and the unit cost index only. Unit cost and margin are
+    # rounded to 4 places there, so code reads the exact properties below.
+    db_net_case_cost = models.GeneratedField(
+                        expression=F('case_cost') - F('allowance'),
+                        output_field=models.DecimalField(
+                            max_digits=10, decimal_places=2),
+                        db_persist=True, db_column='net_case_cost')
+    db_unit_cost    = models.GeneratedField(
+                        expression=Case(
+                            When(case_pack__gt=0,
+                                 then=(F('case_cost') - F('allowance'))
+                                      / F('case_pack')),
+                            default=None),
+                        output_field=models.DecimalField(
+                            max_digits=12, decimal_places=4),
+                        db_persist=True, db_index=True, db_column='unit_cost')
+    db_margin       = models.GeneratedField(
+                        expression=Case(
+                            When(case_pack__gt=0, retail_price__gt=0,
+                                 then=(F('retail_price')
+                                       - (F('case_cost') - F('allowance'))
+                                       / F('case_pack'))
+                                      / F('retail_price')),
+                            default=None),
+                        output_field=models.DecimalField(
+                            max_digits=10, decimal_places=4),
+                        db_persist=True, db_column='margin')
+
     # Metadata
     vendor_comments = models.TextField(blank=True, null=True)
     notes           = models.TextField(blank=True, null=True)
-    is_active       = models.BooleanField(default=True)
+    is_active       = models.BooleanField(default=True)  # see vendor above
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
 
+    objects = ItemQuerySet.as_manager()
+
+    # Not shown on list pages — defer() them there
+    LIST_DEFERRED_FIELDS = ('notes', 'vendor_comments', 'movement_updated_at')
+
     class Meta:
         db_table            = 'dsd_item'
         unique_together     = [('vendor', 'upc')]
         ordering            = ['vendor', 'seq', 'description']
         verbose_name        = 'Item'
         verbose_name_plural = 'Items'
+        indexes             = [
+            models.Index(fields=['vendor', 'is_active']),
+            models.Index(fields=['vendor', 'seq', 'description']),
+        ]
 
     def __str__(self):
         return f'{self.upc} — {self.description}'
 
-    # ---- Calculated properties (mirror MySQL generated columns) ----
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so dsd.signals can refresh the old vendor's counts
+        # when an item is moved to another vendor
+        instance._loaded_vendor_id = instance.__dict__.get('vendor_id')
+        return instance
 
-    @property
+    # ---- Calculated properties ----
+    # Cached per instance — call clear_cost_cache() after changing
+    # case_cost, allowance, case_pack or retail_price in memory.
+
+    COST_CACHE_ATTRS = ('net_case_cost', 'unit_cost', 'margin')
+
+    def clear_cost_cache(self):
+        for attr in self.COST_CACHE_ATTRS:
+            self.__dict__.pop(attr, None)
+
+    @cached_property
     def net_case_cost(self):
         return self.case_cost - self.allowance
 
-    @property
+    @cached_property
     def unit_cost(self):
         if self.case_pack and self.case_pack > 0:
-            return self.net_case_cost / Decimal(str(self.case_pack))
+            return self.net_case_cost / Decimal(self.case_pack)
         return None
 
-    @property
+    @cached_property
     def margin(self):
-        if self.retail_price and self.retail_price > 0 and self.unit_cost is not None:
-            return (self.retail_price - self.unit_cost) / self.retail_price
+        unit_cost = self.unit_cost
+        if self.retail_price and self.retail_price > 0 and unit_cost is not None:
+            return (self.retail_price - unit_cost) / self.retail_price
         return None
 
     @property
@@ -180,14 +299,29 @@ class Item(models.Model):
             return f'{float(self.margin) * 100:.1f}%'
         return '—'
 
+    @cached_property
+    def _pending(self):
+        # One lookup serves both properties below; uses the
+        # with_pending() prefetch when the queryset had it
+        if hasattr(self, '_pending_pcc_cache'):
+            return self._pending_pcc_cache[0] if self._pending_pcc_cache else None
+        return (
+            self.pending_cost_changes.filter(status='PENDING')
+            .only(*PENDING_PREVIEW_FIELDS).first()
+        )
+
     @property
     def has_pending_cost_change(self):
-        return self.pending_cost_changes.filter(status='PENDING').exists()
+        return self._pending is not None
 
     @property
     def pending_cost_change(self):
         """Returns the current pending cost change if one exists"""
-        return self.pending_cost_changes.filter(status='PENDING').first()
+        return self._pending
+
+
+# Unit cost movement for a PendingCostChange
+CostDeltas = namedtuple('CostDeltas', 'old_unit new_unit amount pct')
 
 
 # ============================================================
@@ -195,6 +329,94 @@ class Item(models.Model):
 # Vendor-initiated cost changes awaiting buyer review
 # Buyer sets the approved retail (the resulting price change)
 # ============================================================
+class PendingCostChangeQuerySet(models.QuerySet):
+
+    def for_worklist(self):
+        """
+        Join the item, vendor, link group and users rendered on each
+        worklist row so the page loads in a single query.
+        Text columns the worklist never shows are left out of the SELECT.
+        """
+        return (
+            self.select_related('item__vendor', 'item__link_group',
+                                'submitted_by', 'approved_by')
+            .defer('notes', 'item__vendor__notes',
+                   *(f'item__{f}' for f in Item.LIST_DEFERRED_FIELDS))
+            .order_by('effective_date', 'vendor_code')
+        )
+
+    def bulk_apply(self, ids, user):
+        """Apply the APPROVED changes with the given ids. See bulk_apply_to_items()."""
+        return self.filter(pk__in=ids).bulk_apply_to_items(user)
+
+    def bulk_apply_to_items(self, user):
+        """
+        Apply every APPROVED change in this queryset to its item.
+        Same result as calling apply_to_item() on each in effective date
+        order, but history rows are bulk inserted, items sharing the same
+        final values are updated together and statuses flipped with one
+        UPDATE. Returns the number applied.
+        """
+        with transaction.atomic():
+            changes = list(
+                self.filter(status='APPROVED')
+                .select_related('item').select_for_update()
+                .order_by('effective_date', 'pk')
+            )
+            if not changes:
+                return 0
+
+            now = timezone.now()
+            histories = []
+            # Stage every change for an item on one shared instance, in
+            # effective date order, so a later change overwrites an
+            # earlier one and each history row starts from the values
+            # the previous change left
+            items, item_fields = {}, defaultdict(set)
+            for change in changes:
+                change.item = items.setdefault(change.item_id, change.item)
+                history, fields = change._stage_apply(user, now)
+                histories.append(history)
+                item_fields[change.item_id].update(fields)
+                change.status     = 'APPLIED'
+                change.applied_at = now
+
+            # Vendor cost lists often give many items the same new cost —
+            # group by the final values being written so each group is
+            # one plain UPDATE ... WHERE id IN (...) instead of CASE/WHEN
+            groups = defaultdict(list)
+            for item_id, item in items.items():
+                fields = item_fields[item_id]
+                retail = item.retail_price if 'retail_price' in fields else None
+                groups[(item.case_cost, item.allowance, retail)].append(
+                    (item, fields))
+
+            ChangeHistory.objects.bulk_create(histories, batch_size=1000)
+
+            singles, single_fields = [], set()
+            for (case_cost, allowance, retail), members in groups.items():
+                if len(members) == 1:
+                    item, fields = members[0]
+                    singles.append(item)
+                    single_fields.update(fields)
+                    continue
+                values = dict(case_cost=case_cost, allowance=allowance,
+                              last_cost_change=now.date(), updated_at=now)
+                if retail is not None:
+                    values.update(retail_price=retail,
+                                  last_price_change=now.date())
+                Item.objects.filter(
+                    pk__in=[item.pk for item, _ in members]).update(**values)
+            if singles:
+                Item.objects.bulk_update(singles, sorted(single_fields),
+                                         batch_size=500)
+
+            self.model.objects.filter(pk__in=[c.pk for c in changes]).update(
+                status='APPLIED', applied_at=now, updated_at=now)
+
+        return len(changes)
+
+
 class PendingCostChange(models.Model):
 
     STATUS_CHOICES = [
@@ -260,11 +482,17 @@ class PendingCostChange(models.Model):
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
 
+    objects = PendingCostChangeQuerySet.as_manager()
+
     class Meta:
         db_table            = 'dsd_pending_cost_change'
         ordering            = ['effective_date', 'vendor_code']
         verbose_name        = 'Pending Cost Change'
         verbose_name_plural = 'Pending Cost Changes'
+        indexes             = [
+            models.Index(fields=['item', 'status']),
+            models.Index(fields=['status', 'effective_date', 'vendor_code']),
+        ]
 
     def __str__(self):
         return f'{self.vendor_code}/{self.upc} — {self.get_status_display()}'
@@ -275,29 +503,39 @@ class PendingCostChange(models.Model):
     def new_net_case_cost(self):
         return self.new_case_cost - self.new_allowance
 
-    @property
+    @cached_property
     def new_unit_cost(self):
         if self.item and self.item.case_pack > 0:
-            return self.new_net_case_cost / Decimal(str(self.item.case_pack))
+            return self.new_net_case_cost / self.item.case_pack
         return None
 
+    @cached_property
+    def _cost_deltas(self):
+        """
+        Old/new unit cost, dollar change and % change, computed together
+        once per instance. Fields are None where they can't be calculated.
+        """
+        new_unit = self.new_unit_cost
+        if self.prev_case_cost is None or new_unit is None:
+            return CostDeltas(None, new_unit, None, None)
+
+        old_unit = ((self.prev_case_cost - (self.prev_allowance or 0))
+                    / self.item.case_pack)
+        amount = new_unit - old_unit
+        pct = None
+        if self.prev_case_cost and old_unit > 0:
+            pct = (float(amount) / float(old_unit)) * 100
+        return CostDeltas(old_unit, new_unit, amount, pct)
+
     @property
     def cost_change_amount(self):
         """Dollar change in unit cost"""
-        if self.prev_case_cost is not None and self.item.case_pack > 0:
-            old_unit = (self.prev_case_cost - (self.prev_allowance or 0)) / self.item.case_pack
-            if self.new_unit_cost is not None:
-                return self.new_unit_cost - old_unit
-        return None
+        return self._cost_deltas.amount
 
     @property
     def cost_change_pct(self):
         """Percentage change in unit cost"""
-        if self.cost_change_amount is not None and self.prev_case_cost:
-            old_unit = (self.prev_case_cost - (self.prev_allowance or 0)) / self.item.case_pack
-            if old_unit > 0:
-                return (float(self.cost_change_amount) / float(old_unit)) * 100
-        return None
+        return self._cost_deltas.pct
 
     @property
     def retail_is_overridden(self):
@@ -315,17 +553,15 @@ class PendingCostChange(models.Model):
             self.approved_retail = retail_override
         elif self.approved_retail is None:
             self.approved_retail = self.suggested_retail
-        self.save()
+        self.save(update_fields=['status', 'approved_by', 'approved_at',
+                                 'approved_retail', 'updated_at'])
 
-    def apply_to_item(self, user):
+    def _stage_apply(self, user, now):
         """
-        Promote approved cost change to the live item record.
-        Writes unified change history record.
-        Determines change_type based on whether retail actually changed.
+        Build the ChangeHistory row for this change and copy the new
+        cost (and retail, if it changed) onto self.item in memory.
+        Returns (unsaved history, list of item fields touched).
         """
-        if self.status != 'APPROVED':
-            raise ValueError('Cost change must be APPROVED before applying')
-
         item = self.item
 
         # Determine change type
@@ -335,8 +571,9 @@ class PendingCostChange(models.Model):
         )
         change_type = 'COST_AND_PRICE' if retail_changed else 'COST_ONLY'
 
-        # Write history before updating item
-        ChangeHistory.objects.create(
+        # Snapshot history before updating item. Read from the in-memory
+        # item, so several changes staged on one instance chain up
+        history = ChangeHistory(
             vendor_code             = item.vendor_id,
             upc                     = item.upc,
             change_type             = change_type,
@@ -355,16 +592,36 @@ class PendingCostChange(models.Model):
         # Update item
         item.case_cost          = self.new_case_cost
         item.allowance          = self.new_allowance
-        item.last_cost_change   = timezone.now().date()
+        item.last_cost_change   = now.date()
+        item.updated_at         = now
+        item_fields = ['case_cost', 'allowance', 'last_cost_change', 'updated_at']
         if retail_changed:
             item.retail_price       = self.approved_retail
-            item.last_price_change  = timezone.now().date()
-        item.save()
+            item.last_price_change  = now.date()
+            item_fields += ['retail_price', 'last_price_change']
+        item.clear_cost_cache()
+
+        return history, item_fields
+
+    def apply_to_item(self, user):
+        """
+        Promote approved cost change to the live item record.
+        Writes unified change history record.
+        Determines change_type based on whether retail actually changed.
+        """
+        if self.status != 'APPROVED':
+            raise ValueError('Cost change must be APPROVED before applying')
+
+        now = timezone.now()
+        with transaction.atomic():
+            history, item_fields = self._stage_apply(user, now)
+            history.save()
+            self.item.save(update_fields=item_fields)
 
-        # Mark change as applied
-        self.status     = 'APPLIED'
-        self.applied_at = timezone.now()
-        self.save()
+            # Mark change as applied
+            self.status     = 'APPLIED'
+            self.applied_at = now
+            self.save(update_fields=['status', 'applied_at', 'updated_at'])
 
 
 # ============================================================
@@ -493,6 +750,9 @@ class BRDataExportLog(models.Model):
         ordering            = ['-export_date']
         verbose_name        = 'BRData Export Log'
         verbose_name_plural = 'BRData Export Log'
+        indexes             = [
+            models.Index(fields=['export_status', 'export_date']),
+        ]
 
     def __str__(self):
         return f'{self.export_type} / {self.vendor_code} / {self.upc} — {self.export_status}'
@@ -0,0 +1,37 @@
+"""
+DSD Price Book Management System
+Signal Handlers
+pricebook_manager / dsd / signals.py
+
+Keep the denormalized Vendor count columns in step with Item and
+PendingCostChange writes. Bulk operations bypass these signals —
+call Vendor.objects.refresh_counts() after them.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Vendor, Item, PendingCostChange
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def refresh_vendor_counts_for_item(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields and not {'is_active', 'vendor'} & set(update_fields):
+        return
+    # Include the vendor the item was loaded under, in case it moved
+    vendor_ids = {instance.vendor_id,
+                  getattr(instance, '_loaded_vendor_id', None)}
+    vendor_ids.discard(None)
+    Vendor.objects.filter(pk__in=vendor_ids).refresh_counts()
+    instance._loaded_vendor_id = instance.vendor_id
+
+
+@receiver(post_save, sender=PendingCostChange)
+@receiver(post_delete, sender=PendingCostChange)
+def refresh_vendor_counts_for_cost_change(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields and 'status' not in update_fields:
+        return
+    Vendor.objects.filter(pk=instance.vendor_code).refresh_counts()
@@ -1,3 +1,148 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import (
+    Vendor, Item, PendingCostChange, ChangeHistory, BRDataExportLog
+)
+
+
+class BulkApplyTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_user('buyer')
+        self.vendor = Vendor.objects.create(vendor_code='V1', vendor_name='Vendor')
+        self.item1  = self.make_item('000000000001')
+        self.item2  = self.make_item('000000000002')
+
+    def make_item(self, upc):
+        return Item.objects.create(
+            vendor=self.vendor, upc=upc, description=upc, case_pack=12,
+            case_cost=Decimal('10.00'), retail_price=Decimal('1.98'))
+
+    def make_change(self, item, case_cost, effective_date):
+        return PendingCostChange.objects.create(
+            item=item, vendor_code=item.vendor_id, upc=item.upc,
+            new_case_cost=Decimal(case_cost), effective_date=effective_date,
+            prev_case_cost=item.case_cost, status='APPROVED')
+
+    def test_later_change_wins_over_shared_group(self):
+        # item2's January change is a single; its February change shares
+        # its new cost with item1, so it lands in a grouped UPDATE
+        self.make_change(self.item2, '13.00', date(2026, 1, 1))
+        self.make_change(self.item2, '14.00', date(2026, 2, 1))
+        self.make_change(self.item1, '14.00', date(2026, 2, 1))
+
+        applied = PendingCostChange.objects.all().bulk_apply_to_items(self.user)
+
+        self.assertEqual(applied, 3)
+        self.item1.refresh_from_db()
+        self.item2.refresh_from_db()
+        self.assertEqual(self.item1.case_cost, Decimal('14.00'))
+        self.assertEqual(self.item2.case_cost, Decimal('14.00'))
+        self.assertFalse(
+            PendingCostChange.objects.exclude(status='APPLIED').exists())
+
+    def test_history_chains_changes_to_same_item(self):
+        self.make_change(self.item1, '11.00', date(2026, 1, 1))
+        self.make_change(self.item1, '12.00', date(2026, 2, 1))
+
+        PendingCostChange.objects.all().bulk_apply_to_items(self.user)
+
+        history = list(
+            ChangeHistory.objects.filter(upc=self.item1.upc)
+            .order_by('pending_cost_change_id')
+            .values_list('old_case_cost', 'new_case_cost', 'old_margin'))
+        self.assertEqual(history, [
+            (Decimal('10.00'), Decimal('11.00'), Decimal('0.5791')),
+            (Decimal('11.00'), Decimal('12.00'), Decimal('0.5370')),
+        ])
+
+
+class CostChangeEntryTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_user('buyer')
+        self.vendor = Vendor.objects.create(vendor_code='V1', vendor_name='Vendor')
+        self.item   = Item.objects.create(
+            vendor=self.vendor, upc='000000000001', description='Item',
+            case_pack=12, case_cost=Decimal('10.00'),
+            retail_price=Decimal('1.98'))
+        self.client.force_login(self.user)
+
+    def test_updates_first_of_several_pending_changes(self):
+        for source in ('IMPORT', 'PORTAL'):
+            PendingCostChange.objects.create(
+                item=self.item, vendor_code='V1', upc=self.item.upc,
+                new_case_cost=Decimal('11.00'), effective_date=date(2026, 1, 1),
+                change_source=source)
+
+        response = self.client.post(
+            reverse('dsd:cost_change_entry', args=['V1', self.item.upc]),
+            {'new_case_cost': '12.00', 'effective_date': '2026-02-01'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            PendingCostChange.objects.filter(new_case_cost=Decimal('12.00'),
+                                             change_source='MANUAL').count(), 1)
+        self.assertEqual(PendingCostChange.objects.count(), 2)
+
+
+class BRDataExportTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_user('buyer')
+        self.vendor = Vendor.objects.create(vendor_code='V1', vendor_name='Vendor')
+        for n in range(3):
+            item = Item.objects.create(
+                vendor=self.vendor, upc=f'00000000000{n}', description='Item',
+                case_cost=Decimal('10.00'))
+            PendingCostChange.objects.create(
+                item=item, vendor_code='V1', upc=item.upc,
+                new_case_cost=Decimal('11.00'), effective_date=date(2026, 1, 1),
+                approved_retail=Decimal('1.98'), status='APPROVED')
+        self.client.force_login(self.user)
+
+    def test_logs_rows_sent_before_disconnect(self):
+        response = self.client.get(reverse('dsd:brdata_export'))
+        content = iter(response.streaming_content)
+        for _ in range(3):      # header + two rows
+            next(content)
+        response.close()        # client went away
+
+        self.assertEqual(BRDataExportLog.objects.count(), 2)
+
+
+class VendorCountTests(TestCase):
+
+    def test_moving_item_refreshes_both_vendors(self):
+        old = Vendor.objects.create(vendor_code='V1', vendor_name='Old')
+        new = Vendor.objects.create(vendor_code='V2', vendor_name='New')
+        Item.objects.create(vendor=old, upc='000000000001', description='Item')
+
+        item = Item.objects.get(upc='000000000001')
+        item.vendor = new
+        item.save()
+
+        old.refresh_from_db()
+        new.refresh_from_db()
+        self.assertEqual(old.active_item_count, 0)
+        self.assertEqual(new.active_item_count, 1)
+
+    def test_refresh_counts_after_bulk_deactivate(self):
+        vendor = Vendor.objects.create(vendor_code='V1', vendor_name='Vendor')
+        for upc in ('000000000001', '000000000002'):
+            Item.objects.create(vendor=vendor, upc=upc, description='Item')
+
+        # queryset.update() skips the signals — the dashboard total is
+        # only right once refresh_counts() has run
+        Item.objects.filter(upc='000000000001').update(is_active=False)
+        Vendor.objects.refresh_counts()
 
-# Create your tests here.
+        self.client.force_login(User.objects.create_user('buyer'))
+        response = self.client.get(reverse('dsd:dashboard'))
+        self.assertEqual(response.context['item_count'],
+                         Item.objects.filter(is_active=True).count())
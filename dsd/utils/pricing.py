@@ -5,12 +5,16 @@ pricebook_manager / dsd / utils / pricing.py
 
 import re
 from decimal import Decimal, ROUND_UP
+from functools import lru_cache
 
 
 # ============================================================
 # UPC UTILITIES
 # ============================================================
 
+_NON_DIGIT_RE = re.compile(r'\D')
+
+
 def normalize_upc(raw_upc):
     """
     Strip all non-numeric characters from UPC.
@@ -19,10 +23,20 @@ def normalize_upc(raw_upc):
     """
     if raw_upc is None:
         return None
-    cleaned = re.sub(r'\D', '', str(raw_upc)).strip()
+    return _normalize_upc_str(str(raw_upc))
+
+
+@lru_cache(maxsize=1 << 16)
+def _normalize_upc_str(raw_upc):
+    # Cached — the same UPCs recur across vendor import files
+    cleaned = _NON_DIGIT_RE.sub('', raw_upc)
     return cleaned if cleaned else None
 
 
+# UPC-A, EAN-13, ITF-14
+_VALID_UPC_LENGTHS = frozenset((12, 13, 14))
+
+
 def validate_upc(upc):
     """
     Validate a normalized UPC.
@@ -31,9 +45,10 @@ def validate_upc(upc):
     """
     if not upc:
         return False, 'UPC is empty'
-    if not upc.isdigit():
+    # isascii() first — isdigit() alone accepts non-ASCII digits like '٣'
+    if not (upc.isascii() and upc.isdigit()):
         return False, f'UPC contains non-numeric characters: {upc}'
-    if len(upc) not in (12, 13, 14):
+    if len(upc) not in _VALID_UPC_LENGTHS:
         return False, f'UPC length {len(upc)} is invalid (expected 12, 13, or 14)'
     return True, 'OK'
 
@@ -61,21 +76,22 @@ def suggest_retail(new_unit_cost, current_margin):
     unit_cost = Decimal(str(new_unit_cost))
     margin = Decimal(str(current_margin))
 
-    if margin <= 0 or margin >= 1:
-        return None
-    if unit_cost <= 0:
+    if margin <= 0 or margin >= 1 or unit_cost <= 0:
         return None
 
-    # Theoretical retail at exact margin
-    theoretical = unit_cost / (1 - margin)
+    # Theoretical retail at exact margin.
+    # Work in cents to avoid float precision issues
+    theoretical_cents = int(unit_cost / (1 - margin) * 100)
 
-    # Find the next price ending in .X8 >= theoretical
-    # Candidate endings: .08, .18, .28, .38, .48, .58, .68, .78, .88, .98
-    # Then 1.08, 1.18, etc.
+    return Decimal(_round_to_x8(theoretical_cents)).scaleb(-2)
 
-    # Work in cents to avoid float precision issues
-    theoretical_cents = int(theoretical * 100)
 
+def _round_to_x8(theoretical_cents):
+    """
+    Find the next price ending in .X8 >= theoretical (in cents).
+    Candidate endings: .08, .18, .28, .38, .48, .58, .68, .78, .88, .98
+    Then 1.08, 1.18, etc.
+    """
     # Find remainder when dividing by 10
     remainder = theoretical_cents % 10
 
@@ -90,9 +106,7 @@ def suggest_retail(new_unit_cost, current_margin):
     if suggested_cents < theoretical_cents:
         suggested_cents += 10
 
-    suggested = Decimal(suggested_cents) / 100
-
-    return suggested.quantize(Decimal('0.01'))
+    return suggested_cents
 
 
 def calculate_margin(retail_price, unit_cost):
@@ -7,10 +7,13 @@ pricebook_manager / dsd / views.py
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Q
+from django.core.paginator import Paginator
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 import csv
+from collections import defaultdict
 
 from .models import (
     Vendor, LinkGroup, Item, PendingCostChange, ChangeHistory, BRDataExportLog
@@ -25,33 +28,42 @@ from .utils.pricing import suggest_retail, normalize_upc
 def dashboard(request):
     today = timezone.now().date()
 
-    # Summary counts
-    vendor_count        = Vendor.objects.filter(is_active=True).count()
-    item_count          = Item.objects.filter(is_active=True).count()
-    pending_count       = PendingCostChange.objects.filter(status='PENDING').count()
-    due_today_count     = PendingCostChange.objects.filter(
-                            status='APPROVED',
-                            effective_date__lte=today).count()
+    # Summary counts. Active items are summed from the per-vendor
+    # cached counts; the due count comes from the due_changes list below.
+    vendor_totals = Vendor.objects.aggregate(
+        vendors=Count('pk', filter=Q(is_active=True)),
+        items=Coalesce(Sum('active_item_count_cached'), 0),
+    )
+    vendor_count        = vendor_totals['vendors']
+    item_count          = vendor_totals['items']
+    pending_count       = PendingCostChange.objects.filter(
+                            status='PENDING').count()
 
     # Vendors with pending changes
     vendors_with_pending = (
-        Vendor.objects.filter(is_active=True)
-        .annotate(pending=Count(
-            'items__pending_cost_changes',
-            filter=Q(items__pending_cost_changes__status='PENDING')))
-        .filter(pending__gt=0)
-        .order_by('-pending')
+        Vendor.objects.filter(is_active=True,
+                              pending_cost_change_count_cached__gt=0)
+        .only('vendor_code', 'vendor_name',
+              'pending_cost_change_count_cached')
+        .order_by('-pending_cost_change_count_cached')
     )
 
     # Recent price history
-    recent_history = ChangeHistory.objects.select_related().order_by(
-                        '-change_date')[:10]
+    recent_history = (
+        ChangeHistory.objects.only(
+            'change_date', 'vendor_code', 'upc',
+            'old_case_cost', 'new_case_cost',
+            'old_retail', 'new_retail', 'changed_by',
+        )
+        .order_by('-change_date')[:10]
+    )
 
-    # Changes due today or overdue
-    due_changes = PendingCostChange.objects.filter(
+    # Changes due today or overdue — evaluated once and counted in Python
+    due_changes = list(PendingCostChange.objects.filter(
                     status='APPROVED',
                     effective_date__lte=today
-                  ).select_related('item__vendor').order_by('effective_date')
+                  ).select_related('item__vendor').order_by('effective_date'))
+    due_today_count = len(due_changes)
 
     context = {
         'vendor_count':         vendor_count,
@@ -73,16 +85,16 @@ def dashboard(request):
 def vendor_list(request):
     vendors = (
         Vendor.objects.filter(is_active=True)
-        .annotate(
-            item_count=Count('items', filter=Q(items__is_active=True)),
-            pending_count=Count(
-                'items__pending_cost_changes',
-                filter=Q(items__pending_cost_changes__status='PENDING'))
-        )
+        .only('vendor_code', 'vendor_name', 'rep_name', 'comm_method',
+              'target_margin', 'active_item_count_cached',
+              'pending_cost_change_count_cached')
         .order_by('vendor_code')
     )
 
-    context = {'vendors': vendors}
+    paginator = Paginator(vendors, 50)
+    page_obj  = paginator.get_page(request.GET.get('page'))
+
+    context = {'page_obj': page_obj}
     return render(request, 'dsd/vendor_list.html', context)
 
 
@@ -96,32 +108,37 @@ def price_book(request, vendor_code):
     # Get all active items grouped by link group
     items = (
         Item.objects.filter(vendor=vendor, is_active=True)
+        .defer(*Item.LIST_DEFERRED_FIELDS)
         .select_related('link_group')
-        .prefetch_related('pending_cost_changes')
+        .with_pending()
         .order_by('link_group__link_code', 'seq', 'description')
     )
 
     # Group items by link group for display
-    groups = {}
+    groups = defaultdict(lambda: {'link_group': None, 'items': []})
     ungrouped = []
+    item_count = 0
     for item in items:
-        if item.link_group:
-            key = item.link_group.link_code
-            if key not in groups:
-                groups[key] = {
-                    'link_group': item.link_group,
-                    'items': []
-                }
-            groups[key]['items'].append(item)
-        else:
+        item_count += 1
+        if item.link_group_id is None:
             ungrouped.append(item)
+            continue
+        group = groups[item.link_group.link_code]
+        group['link_group'] = item.link_group
+        group['items'].append(item)
 
     context = {
         'vendor':    vendor,
-        'groups':    groups,
+        # Plain dict: the template's groups.items lookup would
+        # otherwise create an 'items' key on the defaultdict
+        'groups':    dict(groups),
         'ungrouped': ungrouped,
-        'item_count': items.count(),
-        'all_vendors': Vendor.objects.filter(is_active=True).order_by('vendor_code'),
+        'item_count': item_count,
+        'all_vendors': (
+            Vendor.objects.filter(is_active=True)
+            .only('vendor_code', 'vendor_name')
+            .order_by('vendor_code')
+        ),
     }
     return render(request, 'dsd/price_book.html', context)
 
@@ -161,26 +178,31 @@ def pending_changes(request):
 
     changes = (
         PendingCostChange.objects.filter(status=status_filter)
-        .select_related('item__vendor', 'item__link_group',
-                        'submitted_by', 'approved_by')
-        .order_by('effective_date', 'vendor_code')
+        .for_worklist()
     )
 
     if vendor_filter:
         changes = changes.filter(vendor_code=vendor_filter)
 
+    paginator = Paginator(changes, 50)
+    page_obj  = paginator.get_page(request.GET.get('page'))
+
     # Vendors for filter dropdown
-    vendors = Vendor.objects.filter(is_active=True).order_by('vendor_code')
+    vendors = (
+        Vendor.objects.filter(is_active=True)
+        .only('vendor_code', 'vendor_name')
+        .order_by('vendor_code')
+    )
 
     context = {
-        'changes':       changes,
+        'page_obj':      page_obj,
         'vendors':       vendors,
         'vendor_filter': vendor_filter,
         'status_filter': status_filter,
         'today':         today,
         'status_choices': PendingCostChange.STATUS_CHOICES,
     }
-    return render(request, 'dsd/pending_cost_changes.html', context)
+    return render(request, 'dsd/pending_changes.html', context)
 
 
 # ============================================================
@@ -190,10 +212,6 @@ def pending_changes(request):
 def cost_change_entry(request, vendor_code, upc):
     item = get_object_or_404(Item, vendor_id=vendor_code, upc=upc)
 
-    # Check for existing pending change
-    existing = PendingCostChange.objects.filter(
-                    item=item, status='PENDING').first()
-
     if request.method == 'POST':
         new_case_cost   = request.POST.get('new_case_cost')
         new_allowance   = request.POST.get('new_allowance', 0)
@@ -207,35 +225,43 @@ def cost_change_entry(request, vendor_code, upc):
             new_unit_cost   = (new_case_cost - new_allowance) / item.case_pack
 
             # Calculate suggested retail
-            current_margin  = float(item.margin) if item.margin else float(
-                                item.vendor.target_margin)
+            margin          = item.margin
+            current_margin  = margin if margin else item.vendor.target_margin
             suggested       = suggest_retail(new_unit_cost, current_margin)
 
-            # If existing pending change, update it; otherwise create new
-            if existing:
-                change = existing
+            fields = {
+                'new_case_cost':    new_case_cost,
+                'new_allowance':    new_allowance,
+                'effective_date':   effective_date,
+                'suggested_retail': suggested,
+                'approved_retail':  approved_retail or suggested,
+                'prev_case_cost':   item.case_cost,
+                'prev_allowance':   item.allowance,
+                'prev_retail':      item.retail_price,
+                'prev_margin':      item.margin,
+                'change_source':    'MANUAL',
+                'submitted_by':     request.user,
+                'notes':            notes,
+            }
+
+            # Update the item's pending change if there is one, otherwise
+            # create it. Nothing stops an item having several PENDING rows
+            # (imports, portal), so take the first rather than get()
+            change = PendingCostChange.objects.filter(
+                        item=item, status='PENDING').first()
+            if change:
+                for field, value in fields.items():
+                    setattr(change, field, value)
+                change.save(update_fields=[*fields, 'updated_at'])
             else:
-                change = PendingCostChange(
+                PendingCostChange.objects.create(
                     item        = item,
                     vendor_code = vendor_code,
                     upc         = upc,
+                    status      = 'PENDING',
+                    **fields,
                 )
 
-            change.new_case_cost    = new_case_cost
-            change.new_allowance    = new_allowance
-            change.effective_date   = effective_date
-            change.suggested_retail = suggested
-            change.approved_retail  = approved_retail or suggested
-            change.prev_case_cost   = item.case_cost
-            change.prev_allowance   = item.allowance
-            change.prev_retail      = item.retail_price
-            change.prev_margin      = item.margin
-            change.change_source    = 'MANUAL'
-            change.submitted_by     = request.user
-            change.notes            = notes
-            change.status           = 'PENDING'
-            change.save()
-
             messages.success(
                 request,
                 f'Cost change saved for {item.description}. '
@@ -247,11 +273,19 @@ def cost_change_entry(request, vendor_code, upc):
             messages.error(request, f'Invalid data: {e}')
 
     # GET - show the form
+    # Existing pending change, limited to the fields the form pre-fills
+    existing = (
+        PendingCostChange.objects.filter(item=item, status='PENDING')
+        .only('id', 'new_case_cost', 'new_allowance', 'effective_date',
+              'approved_retail', 'notes')
+        .first()
+    )
+
     # Pre-calculate suggested retail if we have current data
     preview_suggested = None
-    if item.unit_cost and item.margin:
-        preview_suggested = suggest_retail(
-            float(item.unit_cost), float(item.margin))
+    unit_cost, margin = item.unit_cost, item.margin
+    if unit_cost and margin:
+        preview_suggested = suggest_retail(unit_cost, margin)
 
     context = {
         'item':              item,
@@ -267,7 +301,9 @@ def cost_change_entry(request, vendor_code, upc):
 # ============================================================
 @login_required
 def approve_change(request, change_id):
-    change = get_object_or_404(PendingCostChange, id=change_id, status='PENDING')
+    change = get_object_or_404(
+                PendingCostChange.objects.select_related('item'),
+                id=change_id, status='PENDING')
 
     if request.method == 'POST':
         action          = request.POST.get('action')  # 'approve' or 'reject'
@@ -286,7 +322,8 @@ def approve_change(request, change_id):
             change.status = 'REJECTED'
             change.approved_by = request.user
             change.approved_at = timezone.now()
-            change.save()
+            change.save(update_fields=['status', 'approved_by',
+                                       'approved_at', 'updated_at'])
             messages.warning(
                 request,
                 f'Change rejected for {change.item.description}'
@@ -300,7 +337,9 @@ def approve_change(request, change_id):
 # ============================================================
 @login_required
 def apply_change(request, change_id):
-    change = get_object_or_404(PendingCostChange, id=change_id, status='APPROVED')
+    change = get_object_or_404(
+                PendingCostChange.objects.select_related('item'),
+                id=change_id, status='APPROVED')
 
     if request.method == 'POST':
         try:
@@ -320,6 +359,17 @@ def apply_change(request, change_id):
 # BRDATA EXPORT
 # Generate export file for BRData import
 # ============================================================
+EXPORT_LOG_BATCH = 500
+
+
+class Echo:
+    """File-like object whose write() just returns the value — lets
+    csv.writer produce lines for a StreamingHttpResponse."""
+
+    def write(self, value):
+        return value
+
+
 @login_required
 def brdata_export(request):
     """
@@ -337,43 +387,60 @@ def brdata_export(request):
         messages.warning(request, 'No approved changes ready for export.')
         return redirect('dsd:pending_cost_changes')
 
-    # Generate CSV
-    response = HttpResponse(content_type='text/csv')
     filename = f'brdata_export_{today.strftime("%Y%m%d")}.csv'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
-    writer = csv.writer(response)
-
-    # BRData import format - adjust columns to match BRData spec
-    writer.writerow([
-        'ITEM_NO', 'UPC', 'DESCRIPTION', 'NEW_RETAIL',
-        'EFFECTIVE_DATE', 'VENDOR_CODE'
-    ])
-
-    export_records = []
-    for change in changes:
-        writer.writerow([
-            change.item.brdata_item_no or '',
-            change.upc,
-            change.item.description,
-            change.approved_retail,
-            change.effective_date.strftime('%Y%m%d'),
-            change.vendor_code,
-        ])
-        export_records.append(change.id)
-
-    # Log the export
-    for change_id in export_records:
-        BRDataExportLog.objects.create(
-            export_type     = 'PRICE_CHANGE',
-            vendor_code     = changes.get(id=change_id).vendor_code,
-            upc             = changes.get(id=change_id).upc,
-            brdata_item_no  = changes.get(id=change_id).item.brdata_item_no,
-            new_retail      = changes.get(id=change_id).approved_retail,
-            effective_date  = changes.get(id=change_id).effective_date,
-            export_status   = 'SENT',
-            export_file     = filename,
-            exported_by     = request.user.username,
-        )
+    exported_by = request.user.username
+
+    # Stream the CSV — rows are written as they come off the cursor
+    # instead of building the whole file in memory. The export log is
+    # built in the same pass and flushed every EXPORT_LOG_BATCH rows.
+    writer = csv.writer(Echo())
+    rows = changes.values_list(
+        'item__brdata_item_no', 'upc', 'item__description',
+        'approved_retail', 'effective_date', 'vendor_code',
+    )
 
+    def csv_rows():
+        # BRData import format - adjust columns to match BRData spec
+        yield writer.writerow([
+            'ITEM_NO', 'UPC', 'DESCRIPTION', 'NEW_RETAIL',
+            'EFFECTIVE_DATE', 'VENDOR_CODE'
+        ])
+        logs = []
+        try:
+            for (brdata_item_no, upc, description, approved_retail,
+                 effective_date, vendor_code) in rows.iterator(
+                     chunk_size=EXPORT_LOG_BATCH):
+                # Logged before the yield: a client disconnect raises
+                # GeneratorExit at the yield, and the row is already sent
+                logs.append(BRDataExportLog(
+                    export_type     = 'PRICE_CHANGE',
+                    vendor_code     = vendor_code,
+                    upc             = upc,
+                    brdata_item_no  = brdata_item_no,
+                    new_retail      = approved_retail,
+                    effective_date  = effective_date,
+                    export_status   = 'SENT',
+                    export_file     = filename,
+                    exported_by     = exported_by,
+                ))
+                yield writer.writerow([
+                    brdata_item_no or '',
+                    upc,
+                    description,
+                    approved_retail,
+                    effective_date.strftime('%Y%m%d'),
+                    vendor_code,
+                ])
+                if len(logs) >= EXPORT_LOG_BATCH:
+                    BRDataExportLog.objects.bulk_create(logs)
+                    logs = []
+        finally:
+            # Log every row handed to the response, even if the
+            # download is cut short
+            if logs:
+                BRDataExportLog.objects.bulk_create(logs)
+
+    response = StreamingHttpResponse(csv_rows(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
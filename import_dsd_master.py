@@ -1,7 +1,13 @@
 import csv, re, os
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
+from functools import lru_cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
 from dsd.models import Vendor, LinkGroup, Item, PendingCostChange, ChangeHistory
+from dsd.signals import (
+    refresh_vendor_counts_for_item, refresh_vendor_counts_for_cost_change,
+)
 
 CSV_PATH = '/home/codeeqid/dsd.code209.com/DSD_Master_-_Master.csv'
 
@@ -33,12 +39,19 @@ VENDOR_NAMES = {
     "VALEYW":"Valley Wholesale","WONDER":"Wonder/Flowers Baking",
 }
 
+_MONEY_RE = re.compile(r"[^0-9.-]")
+_UPC_RE   = re.compile(r"[^0-9]")
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
 def money(v):
-    if not v: return Decimal("0.00")
-    c = re.sub(r"[^0-9.-]","",str(v))
-    try: return Decimal(c).quantize(Decimal("0.01"))
-    except: return Decimal("0.00")
+    if not v: return ZERO
+    c = _MONEY_RE.sub("",str(v))
+    try: return Decimal(c).quantize(CENT)
+    except: return ZERO
 
+@lru_cache(maxsize=None)
 def pdate(v):
     if not v or not str(v).strip(): return None
     try:
@@ -61,13 +74,36 @@ def pint_none(v):
 def istrue(v):
     return str(v).strip().upper() in ("Y","YES","1","TRUE","X","T") if v else False
 
-print("Clearing data...")
-PendingCostChange.objects.all().delete()
-ChangeHistory.objects.all().delete()
-Item.objects.all().delete()
-LinkGroup.objects.all().delete()
-Vendor.objects.all().delete()
-print("Cleared.\n")
+# Rows are read with csv.reader and indexed by position. Each row is cut
+# or padded to the header width, then one blank cell is appended; a column
+# missing from the sheet points at that cell, giving the same "" that
+# DictReader's .get(name, "") used to (stray trailing cells are dropped,
+# as DictReader filed them under None).
+with open(CSV_PATH, encoding="utf-8-sig") as f:
+    header = next(csv.reader(f))
+ncols  = len(header)
+BLANK  = ncols
+col    = {name: i for i, name in enumerate(header)}.get
+
+def sheet_rows():
+    with open(CSV_PATH, encoding="utf-8-sig") as f:
+        r = csv.reader(f)
+        next(r)
+        for row in r:
+            n = len(row)
+            if n > ncols:
+                del row[ncols:]
+            elif n < ncols:
+                row += [""] * (ncols - n)
+            row.append("")
+            yield row
+
+VC, SEQ, LC, LGN, UPC, VNO, DESC, CP, SIZE = (col(n, BLANK) for n in (
+    "Vendor Code", "SEQ", "Link Code", "Link Group Name", "UPC", "Vendor #",
+    "Long Description", "Case Pack", "Size Alpha"))
+CC, NCC, PQ, PRICE, LCD, DISCO, TPR, MOV, VCOM, NOTES = (col(n, BLANK) for n in (
+    "Case Cost", "Net Case Cost", "Price Qty", "Price", "Last Change Date",
+    "Disco", "TPR", "Movement", "Vendor Comments", "NOTES"))
 
 vc, lgc, buf = {}, {}, []
 stats = dict(v=0, lg=0, i=0, sk=0, err=0)
@@ -75,7 +111,10 @@ stats = dict(v=0, lg=0, i=0, sk=0, err=0)
 def flush():
     if not buf: return
     try:
-        Item.objects.bulk_create(buf, ignore_conflicts=True)
+        # Savepoint, so a failed batch doesn't abort the whole import
+        with transaction.atomic():
+            Item.objects.bulk_create(buf, ignore_conflicts=True,
+                                     batch_size=1000)
         stats["i"] += len(buf)
         print(f"  ... {stats['i']} items")
     except Exception as e:
@@ -83,72 +122,114 @@ def flush():
         stats["err"] += len(buf)
     buf.clear()
 
-with open(CSV_PATH, encoding="utf-8-sig") as f:
-    for row in csv.DictReader(f):
-        v = row.get("Vendor Code","").strip()
+# One transaction for the whole reload: a single commit instead of one
+# per batch, and a failed run leaves the old data in place. Foreign keys
+# are built from rows this script just inserted, so the per-row FK checks
+# are switched off for the load.
+with transaction.atomic(), connection.constraint_checks_disabled():
+    print("Clearing data...")
+    # Every table is reloaded and the vendor counts refreshed at the end,
+    # so skip the per-row count refresh
+    post_delete.disconnect(refresh_vendor_counts_for_item, sender=Item)
+    post_delete.disconnect(refresh_vendor_counts_for_cost_change,
+                           sender=PendingCostChange)
+    try:
+        PendingCostChange.objects.all().delete()
+        ChangeHistory.objects.all().delete()
+        Item.objects.all().delete()
+        LinkGroup.objects.all().delete()
+        Vendor.objects.all().delete()
+    finally:
+        post_delete.connect(refresh_vendor_counts_for_item, sender=Item)
+        post_delete.connect(refresh_vendor_counts_for_cost_change,
+                            sender=PendingCostChange)
+    print("Cleared.\n")
+
+    # First pass: collect the distinct vendors and link groups so each
+    # table is loaded with one bulk insert instead of an INSERT per key
+    # Codes are cut to the column length (20) here and in the second
+    # pass, so the keys match what the database stores and reads back
+    vendor_codes, group_names = {}, {}
+    for row in sheet_rows():
+        v = row[VC].strip()[:20]
+        if not v or v=="#REF!":
+            continue
+        vendor_codes.setdefault(v, None)
+        lc = row[LC].strip()[:20]
+        if lc:
+            group_names.setdefault((v, lc), row[LGN].strip() or lc)
+
+    Vendor.objects.bulk_create([
+        Vendor(
+            vendor_code=v,
+            vendor_name=VENDOR_NAMES.get(v, v),
+            comm_method="EXCEL",
+            target_margin=Decimal("0.2800"),
+        )
+        for v in vendor_codes
+    ])
+    vc.update(Vendor.objects.in_bulk(list(vendor_codes)))
+    for v in vendor_codes:
+        print(f"  {v} - {vc[v].vendor_name}")
+    stats["v"] = len(vc)
+
+    # Link groups have an auto id, which MySQL doesn't hand back from a
+    # bulk insert — read them back to get it
+    LinkGroup.objects.bulk_create([
+        LinkGroup(vendor=vc[v], link_code=lc, link_group_name=name)
+        for (v, lc), name in group_names.items()
+    ])
+    for g in LinkGroup.objects.all():
+        lgc[f"{g.vendor_id}|{g.link_code}"] = g
+    stats["lg"] = len(lgc)
+
+    # Second pass: items
+    for row in sheet_rows():
+        v = row[VC].strip()[:20]
         if not v or v=="#REF!":
             stats["sk"] += 1
             continue
 
-        if v not in vc:
-            obj = Vendor.objects.create(
-                vendor_code=v,
-                vendor_name=VENDOR_NAMES.get(v, v),
-                comm_method="EXCEL",
-                target_margin=Decimal("0.2800"),
-            )
-            vc[v] = obj
-            stats["v"] += 1
-            print(f"  {v} - {obj.vendor_name}")
-
-        lc = row.get("Link Code","").strip()
-        lg = None
-        if lc:
-            k = f"{v}|{lc}"
-            if k not in lgc:
-                lgc[k] = LinkGroup.objects.create(
-                    vendor=vc[v], link_code=lc,
-                    link_group_name=row.get("Link Group Name","").strip() or lc,
-                )
-                stats["lg"] += 1
-            lg = lgc[k]
-
-        upc = re.sub(r"[^0-9]","",str(row.get("UPC","")).strip())
+        lc = row[LC].strip()[:20]
+        lg = lgc[f"{v}|{lc}"] if lc else None
+
+        upc = _UPC_RE.sub("",row[UPC].strip())
         if not upc:
             stats["sk"] += 1
             continue
 
-        cc    = money(row.get("Case Cost",""))
-        net   = money(row.get("Net Case Cost",""))
-        allow = (cc - net).quantize(Decimal("0.01")) if net > 0 and net < cc else Decimal("0.00")
-        lcd   = pdate(row.get("Last Change Date",""))
+        cc    = money(row[CC])
+        net   = money(row[NCC])
+        allow = (cc - net).quantize(CENT) if ZERO < net < cc else ZERO
+        lcd   = pdate(row[LCD])
 
         buf.append(Item(
             vendor=vc[v], upc=upc,
-            seq=pint_none(row.get("SEQ","")),
+            seq=pint_none(row[SEQ]),
             link_group=lg,
-            brdata_item_no=row.get("Vendor #","").strip()[:20] or None,
-            description=row.get("Long Description","").strip()[:100],
-            case_pack=pint(row.get("Case Pack",""),1),
-            size_alpha=row.get("Size Alpha","").strip()[:20] or None,
+            brdata_item_no=row[VNO].strip()[:20] or None,
+            description=row[DESC].strip()[:100],
+            case_pack=pint(row[CP],1),
+            size_alpha=row[SIZE].strip()[:20] or None,
             case_cost=cc,
             allowance=allow,
-            price_qty=pint(row.get("Price Qty",""),1),
-            retail_price=money(row.get("Price","")) or None,
+            price_qty=pint(row[PQ],1),
+            retail_price=money(row[PRICE]) or None,
             last_cost_change=lcd,
             last_price_change=lcd,
-            is_disco=istrue(row.get("Disco","")),
-            is_tpr=istrue(row.get("TPR","")),
-            movement=pint_none(row.get("Movement","")),
-            vendor_comments=row.get("Vendor Comments","").strip()[:500] or None,
-            notes=row.get("NOTES","").strip()[:500] or None,
+            is_disco=istrue(row[DISCO]),
+            is_tpr=istrue(row[TPR]),
+            movement=pint_none(row[MOV]),
+            vendor_comments=row[VCOM].strip()[:500] or None,
+            notes=row[NOTES].strip()[:500] or None,
             is_active=True,
         ))
 
-        if len(buf) >= 500:
+        if len(buf) >= 5000:
             flush()
 
-flush()
+    flush()
+    Vendor.objects.refresh_counts()
 
 print(f"\nVendors:{stats['v']} LinkGroups:{stats['lg']} Items:{stats['i']} Skipped:{stats['sk']} Errors:{stats['err']}")
 print(f"DB: Vendors:{Vendor.objects.count()} Items:{Item.objects.count()} Dated:{Item.objects.filter(last_cost_change__isnull=False).count()}")